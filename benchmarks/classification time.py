@@ -1,220 +1,351 @@
-# Calculate the average time between a failed CI task finishing and it getting
-# classified.
-# LIMITATIONS:
-# - Is not aware of retriggers (task gets cloned on the same push and run) and
-#   backfills (task gets added to previous pushes) which are used to identify
-#   if an issue is permanent or frequent or which push causes it.
-# For this reason, the longest classification times are not taken into account
-# but the highest percentiles are ignored (see below for threshold).
-
-
-def log_debug(message):
-    if DEBUG:
-        print(message)
-
-def value_from_list(list, key):
-    return list[header_to_index[key]]
-
-import argparse
-import json
-import urllib.request
-from datetime import datetime
-
-DATA_SOURCE_QUERY_ID = 78112
-
-parser = argparse.ArgumentParser(description='Calculate average time for task classifications on sheriffed trees.')
-
-# API key for access to the query data on https://sql.telemetry.mozilla.org
-# By default only available to Mozilla employees. On the query page, open its
-# menu, call the menu item "Show API Key" and copy the string after the
-# "api_key=" in the url.
-parser.add_argument('--key',
-                    metavar='api_key',
-                    type=str,
-                    required=True,
-                    help='API key for https://sql.telemetry.mozilla.org')
-
-# Percentage of fastest response times to use between 0 and 100. Slower
-# ones will be ignored. E.g. reclassifications create slow times (old
-# classification gets deleted).
-parser.add_argument('--debug',
-                    action='store_true',
-                    help="Turn on debug logging")
-
-# Percentage of fastest response times to use between 0 and 100. Slower
-# ones will be ignored. E.g. reclassifications create slow times (old
-# classification gets deleted).
-parser.add_argument('--percent', type=int, default=95,
-                    help="Percentage of fastest response times to use (int, 0..100)")
-
-# Time in seconds in which the job should be classified. If retriggers start
-# not after this time limit after the task ended, the time delta between initial
-# task failure and classification will be part of the calculation.
-parser.add_argument('--response-limit', type=int, default=15*60,
-                    help="Time in seconds in which the job should be classified (int)")
-
-# Maximum time after a push in which a job has to start to be taken into
-# account. Used to exclude manually requested jobs (retriggers, backfills)
-# which might not be shown anymore on the jobs watched by the sheriffs
-# because they regard the push as done. Time is in seconds.
-parser.add_argument('--start-delay', type=int, default=4*60*60,
-                    help="Maximum time after a push in which a job has to start (int)")
-
-args = parser.parse_args()
-query_args = vars(args)
-
-DEBUG = query_args["debug"]
-
-DATA_SOURCE_API_KEY = query_args["key"]
-
-# The .csv format gets used because the order of rows is important - adjacent
-# rows are used for calculations.
-DATA_SOURCE_URL = ("https://sql.telemetry.mozilla.org/api/queries/" +
-                   str(DATA_SOURCE_QUERY_ID) +
-                   "/results.json?api_key=" +
-                   DATA_SOURCE_API_KEY)
-log_debug(("DATA_SOURCE_URL:", DATA_SOURCE_URL))
-
-CLASSIFICATION_DELAY_MAX = 24 * 60 * 60
-
-# TODO: support passing start and end date into query
-# parser = RecipeParser('date')
-
-PERCENTAGE_TO_USE = query_args["percent"]
-RESPONSE_LIMIT = query_args["response_limit"]
-JOB_START_DELAY_MAX = query_args["start_delay"]
-
-# A failed job can be classified or be checked for its intermittance with
-# retriggers. Waiting for those retriggers should not be counted against the
-# classification time but sql.telemetry.mozilla.org is not able to export
-# this data (query timeout)
-
-# A job group is the set of all job runs which have the push, platform and
-# job configuration in common. By default, this is 1 (or 0), unless a job
-# gets retriggers or backfilled (or automatically retried, e.g. because the
-# machine got terminated by the machine pool provider - irrelevant here).
-jobGroups = []
-jobGroup = {"repositoryName": None,
-            "pushRevision": None,
-            "jobName": None, # concatenation of platform and test suite config
-            "jobs": []}
-
-data_request = urllib.request.urlopen(DATA_SOURCE_URL, timeout=60)
-
-data = json.load(data_request)
-rows = data["query_result"]["data"]["rows"]
-
-data_row_next = rows[0]
-for row_pos in range(len(rows)):
-    data_row = data_row_next
-    data_row_next = rows[row_pos]
-    jobGroupEndsWithRow = False
-    if row_pos == len(rows) - 1:
-        jobGroupEndsWithRow = True
-    else:
-        if (data_row["repository_id"] != data_row_next["repository_id"] or
-            data_row["push_id"] != data_row_next["push_id"] or
-            data_row["job_type_name"] != data_row_next["job_type_name"]):
-            # Next row contains new job group.
-            jobGroupEndsWithRow = True
-    if jobGroup["repositoryName"] is None:
-        # Set up job group.
-        jobGroup["repositoryName"] = data_row["repository_name"]
-        jobGroup["pushRevision"] = data_row["push_revision"]
-        jobGroup["jobName"] = data_row["job_type_name"]
-    
-    classification_timestamp = None
-    try:
-        classification_timestamp = datetime.strptime(data_row["classification_timestamp"], "%Y-%m-%dT%H:%M:%S.%f")
-    except ValueError as error:
-        # If all microseconds of the timestamp are zero, the .json export
-        # doesn't contain digits for the milliseconds
-        # https://github.com/mozilla/redash/issues/1016
-        classification_timestamp = datetime.strptime(data_row["classification_timestamp"], "%Y-%m-%dT%H:%M:%S")
-    jobGroup["jobs"].append({# Timestamp of the push
-                             'repo.push.date': datetime.strptime(data_row["push_time"], "%Y-%m-%dT%H:%M:%S").timestamp(),
-                             # Type of the failure classification, e.g. "intermittent", "fixed by commit"
-                             'failure.notes.failure_classification': data_row["classification_name"],
-                             # Timestamp of the creation of the failure classification 
-                             'failure.notes.created': classification_timestamp.timestamp(),
-                             # Timestamp of the job's start time
-                             'action.start_time': datetime.strptime(data_row["job_start_time"], "%Y-%m-%dT%H:%M:%S").timestamp(),
-                             # Timestamp of the job's end time (int)
-                             'action.end_time': datetime.strptime(data_row["job_end_time"], "%Y-%m-%dT%H:%M:%S").timestamp()})
-    if jobGroupEndsWithRow:
-        jobGroups.append(jobGroup)
-        jobGroup = {"repositoryName": None,
-                    "pushRevision": None,
-                    "jobName": None, # concatenation of platform and test suite config
-                    "jobs": []}
-
-# Ignore each job group which at least one job which has been classified as "fixed by commit".
-jobGroupsFiltered = list(
-                        filter(
-                            lambda jobGroup:
-                                len(
-                                    list(
-                                        filter(
-                                            lambda job:
-                                                job['failure.notes.failure_classification'] == "fixed by commit",
-                                            jobGroup["jobs"]
-                                        ),
-                                    )
-                                ) == 0,
-                        jobGroups)
-                    )
-
-# Holds all the response time for failures. The highest ones will get
-# ignored, e.g. for reclassifications.
-classificationTimedeltas = []
-for jobGroup in jobGroupsFiltered:
-    jobGroup["jobs"].sort(key=lambda job: job["action.start_time"])
-    # lastTimeOk holds the end time of the last job which started before an
-    # inactivity gap bigger than RESPONSE_LIMIT
-    lastTimeOk = None
-    for job in jobGroup["jobs"]:
-        if not lastTimeOk:
-            lastTimeOk = job["action.end_time"]
-        else:
-            # RESPONSE_LIMIT threshold in which action must be taken
-            if job["action.start_time"] - lastTimeOk <= RESPONSE_LIMIT:
-                lastTimeOk = job["action.end_time"]
-            else:
-                # Found a gap
-                break
-    # Filter out jobs which have started more than the allowed time after the push
-    jobsNormalTime = []
-    for job in jobGroup["jobs"]:
-        # Ignore pushes that don't have meta data for the push datetime.
-        if not job["repo.push.date"]:
-            continue
-        if job["action.start_time"] - job["repo.push.date"] <= JOB_START_DELAY_MAX:
-            jobsNormalTime.append(job)
-    # jobsNormalTime = list(filter(lambda job: job["action.start_time"] - job["repo.push.date"] <= JOB_START_DELAY_MAX, jobGroup["jobs"]))
-    jobsNormalTime.sort(key=lambda job: job["action.start_time"])
-    jobGroup["jobs"] = jobsNormalTime
-    for job in jobsNormalTime:
-        # 1 classification: string; 2+ classifications: list
-        if isinstance(job["failure.notes.created"], list):
-            classificationTime = min(job["failure.notes.created"])
-        # only one classification time, float instead of list
-        else:
-        # RESPONSE_LIMIT threshold in which action must be taken
-            classificationTime = job["failure.notes.created"]
-        if max(0, int(classificationTime) - lastTimeOk) < CLASSIFICATION_DELAY_MAX:
-            classificationTimedeltas.append(max(0, int(classificationTime) - lastTimeOk))
-classificationTimedeltas.sort()
-if DEBUG:
-    print("Classification times for individual tasks (position: seconds)")
-    for pos in range(len(classificationTimedeltas)):
-        print("%(i)i: %(value).0f" %
-            {
-                'i': pos,
-                'value': classificationTimedeltas[pos],
-            })
-classificationsToUse = int(round(PERCENTAGE_TO_USE / 100 * len(classificationTimedeltas)))
-if len(classificationTimedeltas) > 0 and classificationsToUse == 0:
-    classificationsToUse = 1
-print("classifications used for calculation (count):", len(classificationTimedeltas))
-print("average classification time (s):", int(round(sum(classificationTimedeltas[0:classificationsToUse]) / classificationsToUse)))
-print("limit classification time (s):", classificationTimedeltas[classificationsToUse - 1])
\ No newline at end of file
+# Calculate the average time between a failed CI task finishing and it getting
+# classified.
+# LIMITATIONS:
+# - Is not aware of retriggers (task gets cloned on the same push and run) and
+#   backfills (task gets added to previous pushes) which are used to identify
+#   if an issue is permanent or frequent or which push causes it.
+# For this reason, the longest classification times are not taken into account
+# but the highest percentiles are ignored (see below for threshold).
+
+
+import argparse
+import gzip
+import sys
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, pairwise
+
+import ijson
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional - without it process_group runs as plain Python
+    # over the NumPy arrays, just without the JIT speedup.
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        return wrap
+
+# Timestamp parsing dominates the CPU cost of the row loop and the same raw
+# strings repeat for every row of a job group (identical push_time, often
+# identical job times), so memoize the parsed value by the raw string.
+_ts_cache = {}
+
+def _parse_iso(s):
+    # The export uses the fixed-width format "YYYY-MM-DDTHH:MM:SS[.ffffff]",
+    # so the fields can be sliced out directly instead of paying for
+    # strptime's format interpreter and a datetime object per call. If all
+    # microseconds of the timestamp are zero, the .json export doesn't
+    # contain digits for the milliseconds
+    # https://github.com/mozilla/redash/issues/1016
+    # time.mktime keeps the local-time interpretation that the previous
+    # naive datetime.timestamp() applied.
+    v = time.mktime((int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                     int(s[11:13]), int(s[14:16]), int(s[17:19]), 0, 0, -1))
+    if len(s) > 19:
+        fraction = s[20:]
+        v += int(fraction) / 10 ** len(fraction)
+    return v
+
+def _ts(s):
+    v = _ts_cache.get(s)
+    if v is None:
+        v = _parse_iso(s)
+        _ts_cache[s] = v
+    return v
+
+def _group_key(row):
+    # One tuple comparison per row instead of three dict lookups and three
+    # != checks: tuples compare with a single C-level call which
+    # short-circuits on the first differing field, and the interned
+    # job_type_name makes the common "same group" case a pointer compare.
+    return (row["repository_id"], row["push_id"], sys.intern(row["job_type_name"]))
+
+DATA_SOURCE_QUERY_ID = 78112
+
+CLASSIFICATION_DELAY_MAX = 24 * 60 * 60
+
+# There is only a handful of distinct classification names but json delivers
+# a fresh string object per row. Interning them (and the literal to compare
+# against) turns the per-job equality check in the group filter into a
+# pointer comparison.
+FIXED_BY_COMMIT = sys.intern("fixed by commit")
+
+@njit(cache=True)
+def process_group(push_date, cls_time, start, end, response_limit,
+                  job_start_delay_max, classification_delay_max):
+    # Explicit loops instead of fancy indexing - numba compiles these to
+    # tight machine loops without the temporary arrays. The arrays arrive
+    # sorted by start time, so the scans walk them front to back.
+    # lastTimeOk holds the end time of the last job which started before an
+    # inactivity gap bigger than response_limit
+    lastTimeOk = end[0]
+    for job in range(1, start.size):
+        if start[job] - lastTimeOk <= response_limit:
+            lastTimeOk = end[job]
+        else:
+            # Found a gap
+            break
+    # Truncate and clamp all deltas in one vectorized expression instead of
+    # calling int() and branching per element inside the loop.
+    deltasAll = np.maximum(cls_time.astype(np.int64) - np.int64(lastTimeOk), 0)
+    deltas = np.empty(start.size, np.int64)
+    count = 0
+    for job in range(start.size):
+        # Filter out jobs which started more than the allowed time after
+        # the push.
+        if start[job] - push_date > job_start_delay_max:
+            continue
+        if deltasAll[job] < classification_delay_max:
+            deltas[count] = deltasAll[job]
+            count += 1
+    return deltas[:count]
+
+def process_one(jobGroup, response_limit, job_start_delay_max,
+                classification_delay_max):
+    # The limits arrive as arguments instead of module globals so worker
+    # processes don't depend on import-time state of the main module.
+    # Ignore pushes that don't have meta data for the push datetime.
+    if jobGroup["pushDate"] is None:
+        return np.empty(0, np.int64)
+    # The start/end arrays were already built when the group was closed
+    # during ingestion; only the classification timestamps still need to be
+    # parsed, deferred until here so dropped groups never pay for it.
+    # 1 classification: string; 2+ classifications: list - use the first one
+    cls_time = np.array([min(map(_ts, raw)) if isinstance(raw, list)
+                         else _ts(raw)
+                         for raw in jobGroup["clsTimesRaw"]], dtype=np.float64)
+    return process_group(jobGroup["pushDate"], cls_time, jobGroup["start"],
+                         jobGroup["end"], response_limit,
+                         job_start_delay_max, classification_delay_max)
+
+def main():
+    parser = argparse.ArgumentParser(description='Calculate average time for task classifications on sheriffed trees.')
+
+    # API key for access to the query data on https://sql.telemetry.mozilla.org
+    # By default only available to Mozilla employees. On the query page, open its
+    # menu, call the menu item "Show API Key" and copy the string after the
+    # "api_key=" in the url.
+    parser.add_argument('--key',
+                        metavar='api_key',
+                        type=str,
+                        required=True,
+                        help='API key for https://sql.telemetry.mozilla.org')
+
+    # Percentage of fastest response times to use between 0 and 100. Slower
+    # ones will be ignored. E.g. reclassifications create slow times (old
+    # classification gets deleted).
+    parser.add_argument('--debug',
+                        action='store_true',
+                        help="Turn on debug logging")
+
+    # Percentage of fastest response times to use between 0 and 100. Slower
+    # ones will be ignored. E.g. reclassifications create slow times (old
+    # classification gets deleted).
+    parser.add_argument('--percent', type=int, default=95,
+                        help="Percentage of fastest response times to use (int, 0..100)")
+
+    # Time in seconds in which the job should be classified. If retriggers start
+    # not after this time limit after the task ended, the time delta between initial
+    # task failure and classification will be part of the calculation.
+    parser.add_argument('--response-limit', type=int, default=15*60,
+                        help="Time in seconds in which the job should be classified (int)")
+
+    # Maximum time after a push in which a job has to start to be taken into
+    # account. Used to exclude manually requested jobs (retriggers, backfills)
+    # which might not be shown anymore on the jobs watched by the sheriffs
+    # because they regard the push as done. Time is in seconds.
+    parser.add_argument('--start-delay', type=int, default=4*60*60,
+                        help="Maximum time after a push in which a job has to start (int)")
+
+    # Id of the query on https://sql.telemetry.mozilla.org to download the rows
+    # from. A sibling query of the default one can filter the "fixed by commit"
+    # job groups out server-side, e.g. with
+    #   AND NOT EXISTS (SELECT 1 FROM classifications c2
+    #                   WHERE c2.push_id = p.push_id
+    #                     AND c2.job_type_name = p.job_type_name
+    #                     AND c2.classification_name = 'fixed by commit')
+    # which avoids downloading and parsing rows which get dropped anyway.
+    parser.add_argument('--query-id', type=int, default=DATA_SOURCE_QUERY_ID,
+                        help="Id of the query on https://sql.telemetry.mozilla.org (int)")
+
+    # Set this if the query passed with --query-id already excludes job groups
+    # with a "fixed by commit" classification, so the client-side filter can be
+    # skipped.
+    parser.add_argument('--server-filtered',
+                        action='store_true',
+                        help='Query already excludes "fixed by commit" job groups')
+
+    args = parser.parse_args()
+    query_args = vars(args)
+
+    DEBUG = query_args["debug"]
+
+    DATA_SOURCE_API_KEY = query_args["key"]
+
+    # The .csv format gets used because the order of rows is important - adjacent
+    # rows are used for calculations.
+    DATA_SOURCE_URL = ("https://sql.telemetry.mozilla.org/api/queries/" +
+                       str(query_args["query_id"]) +
+                       "/results.json?api_key=" +
+                       DATA_SOURCE_API_KEY)
+    if DEBUG:
+        print(("DATA_SOURCE_URL:", DATA_SOURCE_URL))
+
+    # TODO: support passing start and end date into query
+    # parser = RecipeParser('date')
+
+    PERCENTAGE_TO_USE = query_args["percent"]
+    RESPONSE_LIMIT = query_args["response_limit"]
+    JOB_START_DELAY_MAX = query_args["start_delay"]
+
+    # A failed job can be classified or be checked for its intermittance with
+    # retriggers. Waiting for those retriggers should not be counted against the
+    # classification time but sql.telemetry.mozilla.org is not able to export
+    # this data (query timeout)
+
+    # A job group is the set of all job runs which have the push, platform and
+    # job configuration in common. By default, this is 1 (or 0), unless a job
+    # gets retriggers or backfilled (or automatically retried, e.g. because the
+    # machine got terminated by the machine pool provider - irrelevant here).
+    jobGroups = []
+    jobGroup = {"repositoryName": None,
+                "pushRevision": None,
+                "jobName": None, # concatenation of platform and test suite config
+                "pushDate": None, # push timestamp, shared by all jobs of the group
+                "jobs": []}
+
+    # Ask for a gzipped transfer - the JSON export compresses well (usually by
+    # 4-8x) and the download is the longest wall-clock segment of this script.
+    data_request = urllib.request.urlopen(
+        urllib.request.Request(DATA_SOURCE_URL, headers={"Accept-Encoding": "gzip"}),
+        timeout=60)
+    if data_request.headers.get("Content-Encoding") == "gzip":
+        data_request = gzip.GzipFile(fileobj=data_request)
+
+    # Stream the rows out of the response instead of loading the complete result
+    # set - potentially hundreds of MB - into memory at once. Rows get processed
+    # while the download is still running and only the current and the next row
+    # are kept around.
+    rows_iter = ijson.items(data_request, "query_result.data.rows.item")
+
+    # pairwise yields each row together with its successor; the sentinel
+    # appended behind the stream makes it yield the last row as well, paired
+    # with the end-of-rows marker.
+    _END_OF_ROWS = object()
+
+    data_row_key = None
+    for data_row, data_row_next in pairwise(chain(rows_iter, [_END_OF_ROWS])):
+        if data_row_key is None:
+            # First row of the stream - all later iterations inherit the key
+            # from their predecessor below.
+            data_row_key = _group_key(data_row)
+        if data_row_next is _END_OF_ROWS:
+            data_row_next_key = None
+            jobGroupEndsWithRow = True
+        else:
+            data_row_next_key = _group_key(data_row_next)
+            # A differing key means the next row contains a new job group.
+            jobGroupEndsWithRow = data_row_key != data_row_next_key
+        if jobGroup["repositoryName"] is None:
+            # Set up job group.
+            jobGroup["repositoryName"] = sys.intern(data_row["repository_name"])
+            jobGroup["pushRevision"] = data_row["push_revision"]
+            jobGroup["jobName"] = sys.intern(data_row["job_type_name"])
+            # The push timestamp is invariant within the group, so parse it once
+            # here instead of once per job. Some pushes don't have meta data for
+            # the push datetime.
+            if data_row["push_time"]:
+                jobGroup["pushDate"] = _ts(data_row["push_time"])
+
+        # Plain tuple per job - (classification name, classification timestamp
+        # as raw string, start, end) - instead of an object per row; the fields
+        # move into per-group arrays when the group is closed below. The
+        # classification timestamp stays a raw string: groups with a
+        # "fixed by commit" job get dropped wholesale, so the most expensive
+        # parse (the only one with fractional seconds) is deferred until after
+        # that filter.
+        jobGroup["jobs"].append((sys.intern(data_row["classification_name"]),
+                                 data_row["classification_timestamp"],
+                                 _ts(data_row["job_start_time"]),
+                                 _ts(data_row["job_end_time"])))
+        if jobGroupEndsWithRow:
+            # Convert to the structure-of-arrays layout once the group is
+            # complete: one contiguous array per numeric field, sorted a single
+            # time by start time - everything downstream (gap scan, filters)
+            # relies on that order and filtering preserves it.
+            jobs = jobGroup.pop("jobs")
+            jobs.sort(key=lambda job: job[2])
+            jobCount = len(jobs)
+            jobGroup["clsNames"] = [job[0] for job in jobs]
+            jobGroup["clsTimesRaw"] = [job[1] for job in jobs]
+            jobGroup["start"] = np.fromiter((job[2] for job in jobs), np.float64, jobCount)
+            jobGroup["end"] = np.fromiter((job[3] for job in jobs), np.float64, jobCount)
+            jobGroups.append(jobGroup)
+            jobGroup = {"repositoryName": None,
+                        "pushRevision": None,
+                        "jobName": None, # concatenation of platform and test suite config
+                        "pushDate": None, # push timestamp, shared by all jobs of the group
+                        "jobs": []}
+        data_row_key = data_row_next_key
+
+    # Ignore each job group which at least one job which has been classified as
+    # "fixed by commit" - unless the query already filtered them server-side.
+    if query_args["server_filtered"]:
+        jobGroupsFiltered = jobGroups
+    else:
+        jobGroupsFiltered = [jobGroup for jobGroup in jobGroups
+                             if not any(clsName == FIXED_BY_COMMIT
+                                        for clsName in jobGroup["clsNames"])]
+
+    # Holds all the response times for failures, one int64 array per job group,
+    # concatenated once at the end. Unboxing every delta into a Python list
+    # would cost several times the memory on large date ranges. A size-bounded
+    # heap would not help here: the cutoff is a percentage of the total count,
+    # which is only known once the stream ends - and it defaults to 95% of the
+    # data anyway. The highest response times will get ignored, e.g. for
+    # reclassifications.
+    deltaChunks = []
+    # Job groups have no data dependencies on each other, so they can be
+    # processed on all cores in parallel. The limits are bound into the
+    # worker callable so it works under any multiprocessing start method.
+    with ProcessPoolExecutor() as executor:
+        for deltas in executor.map(partial(process_one,
+                                           response_limit=RESPONSE_LIMIT,
+                                           job_start_delay_max=JOB_START_DELAY_MAX,
+                                           classification_delay_max=CLASSIFICATION_DELAY_MAX),
+                                   jobGroupsFiltered, chunksize=64):
+            deltaChunks.append(deltas)
+    classificationTimedeltas = (np.concatenate(deltaChunks) if deltaChunks
+                                else np.empty(0, np.int64))
+    if DEBUG:
+        # Only the debug dump needs the complete data in sorted order.
+        classificationTimedeltasSorted = np.sort(classificationTimedeltas)
+        print("Classification times for individual tasks (position: seconds)")
+        for pos in range(len(classificationTimedeltasSorted)):
+            print("%(i)i: %(value).0f" %
+                {
+                    'i': pos,
+                    'value': classificationTimedeltasSorted[pos],
+                })
+    classificationsToUse = int(round(PERCENTAGE_TO_USE / 100 * len(classificationTimedeltas)))
+    if len(classificationTimedeltas) > 0 and classificationsToUse == 0:
+        classificationsToUse = 1
+    # Only the classificationsToUse fastest deltas get used - np.partition
+    # selects them in O(n) instead of sorting the whole array, and only the
+    # selected ones get sorted for the limit below.
+    fastest = np.partition(classificationTimedeltas, classificationsToUse - 1)[:classificationsToUse]
+    fastest.sort()
+    print("classifications used for calculation (count):", len(classificationTimedeltas))
+    print("average classification time (s):", int(round(int(fastest.sum()) / classificationsToUse)))
+    print("limit classification time (s):", int(fastest[-1]))
+
+# The worker processes of the ProcessPoolExecutor import this module, so the
+# script body must not run on import (required for the spawn and forkserver
+# start methods).
+if __name__ == "__main__":
+    main()